@@ -14,7 +14,8 @@ class ConfigureIps(AbstractPlugin):
         set any default gateway information and then
         call the ``configure_ips`` method and ignore possible attribute errors.
         """
-        for vm in self.g.get_vertices():
+        vertices = list(self.g.get_vertices())
+        for vm in vertices:
             # Add in default gateway information if it can be determined
             if vm.type == "router":
                 try:
@@ -28,7 +29,7 @@ class ConfigureIps(AbstractPlugin):
                     ):
                         vm.set_default_gateway(interface)
 
-        for vm in self.g.get_vertices():
+        for vm in vertices:
             if vm.type == "host":
                 try:
                     vm.configure_ips()
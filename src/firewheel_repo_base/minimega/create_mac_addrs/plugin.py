@@ -68,38 +68,44 @@ class CreateMACAddrs(AbstractPlugin):
         self._increment_mac()
         return self._convert_int_to_mac(mac)
 
-    def _find_existing_macs(self):
+    def _find_existing_macs(self, vm_endpoints):
         """
-        Iterate over the graph and add any existing MAC addresses to the
+        Iterate over the VMs and add any existing MAC addresses to the
         global set.
+
+        Args:
+            vm_endpoints (list): The :py:class:`VMEndpoints <base_objects.VMEndpoint>`
+                in the graph.
         """
-        for vm in self.g.get_vertices():
-            if vm.is_decorated_by(VMEndpoint):
-                try:
-                    for iface in vm.interfaces.interfaces:
-                        if "mac" in iface:
-                            self.existing_macs.add(iface["mac"])
-                except AttributeError:
-                    pass
-
-    def _assign_macs(self):
+        for vm in vm_endpoints:
+            try:
+                for iface in vm.interfaces.interfaces:
+                    if "mac" in iface:
+                        self.existing_macs.add(iface["mac"])
+            except AttributeError:
+                pass
+
+    def _assign_macs(self, vm_endpoints):
         """
-        Iterate over the graph and add a MAC address for each interface that
+        Iterate over the VMs and add a MAC address for each interface that
         does not have one yet.
+
+        Args:
+            vm_endpoints (list): The :py:class:`VMEndpoints <base_objects.VMEndpoint>`
+                in the graph.
         """
-        for vm in self.g.get_vertices():
-            if vm.is_decorated_by(VMEndpoint):
-                try:
-                    for iface in vm.interfaces.interfaces:
-                        if "mac" not in iface:
-                            iface["mac"] = self.get_unique_mac()
-                            assert len(iface["mac"]) == 17
-                            self.existing_macs.add(iface["mac"])
-                except AttributeError:
-                    self.log.warning(
-                        'No interfaces found on VM "%s". Cannot create any mac addresses.',
-                        vm.name,
-                    )
+        for vm in vm_endpoints:
+            try:
+                for iface in vm.interfaces.interfaces:
+                    if "mac" not in iface:
+                        iface["mac"] = self.get_unique_mac()
+                        assert len(iface["mac"]) == 17
+                        self.existing_macs.add(iface["mac"])
+            except AttributeError:
+                self.log.warning(
+                    'No interfaces found on VM "%s". Cannot create any mac addresses.',
+                    vm.name,
+                )
 
     def run(self, mac_addr_start=""):
         """
@@ -125,14 +131,19 @@ class CreateMACAddrs(AbstractPlugin):
                 )
                 raise
 
+        # Both passes only need the VMs, so find them once.
+        vm_endpoints = [
+            vm for vm in self.g.get_vertices() if vm.is_decorated_by(VMEndpoint)
+        ]
+
         # Walk the vertices to find and note any existing MACs.
         # A full walk here is needed so we know the first address we assign
         # is unique.
-        self._find_existing_macs()
+        self._find_existing_macs(vm_endpoints)
         self.log.info("Found %d existing mac addresses.", len(self.existing_macs))
 
         # Now begin assigning new MACs where needed.
-        self._assign_macs()
+        self._assign_macs(vm_endpoints)
         self.log.info(
             "After creating macs, know of %d mac addresses.", len(self.existing_macs)
         )
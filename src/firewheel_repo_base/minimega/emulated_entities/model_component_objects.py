@@ -86,12 +86,7 @@ class MinimegaEmulatedVM:
         """
         config_list = []
         try:
-            for interface in self.interfaces.interfaces:
-                iface_conf = {
-                    "name": "nic",
-                    "id": f"if{len(config_list)}",
-                }
-
+            for i, interface in enumerate(self.interfaces.interfaces):
                 # Apply defaults.
                 for default_key, value in self.interface_defaults.items():
                     try:
@@ -99,22 +94,29 @@ class MinimegaEmulatedVM:
                     except KeyError:
                         interface[default_key] = value
 
-                # Finish building the config.
-                iface_conf["switch_name"] = interface["switch"].name
-                keys = ["type", "driver", "mac", "qos"]
-                for k in keys:
-                    try:
-                        iface_conf[k] = interface[k]
-                    except KeyError as exc:
-                        self.log.error(
-                            'Missing required key "%s" on VM "%s". Have: %s',
-                            k,
-                            self.name,
-                            interface,
-                        )
-                        raise RuntimeError(
-                            f'Required key "{k}" not found on interface for VM "{self.name}".'
-                        ) from exc
+                # Build the config in one shot now that the defaults are in place.
+                switch_name = interface["switch"].name
+                try:
+                    iface_conf = {
+                        "name": "nic",
+                        "id": f"if{i}",
+                        "switch_name": switch_name,
+                        "type": interface["type"],
+                        "driver": interface["driver"],
+                        "mac": interface["mac"],
+                        "qos": interface["qos"],
+                    }
+                except KeyError as exc:
+                    k = exc.args[0]
+                    self.log.error(
+                        'Missing required key "%s" on VM "%s". Have: %s',
+                        k,
+                        self.name,
+                        interface,
+                    )
+                    raise RuntimeError(
+                        f'Required key "{k}" not found on interface for VM "{self.name}".'
+                    ) from exc
 
                 try:
                     iface_conf["ip"] = str(interface["network"])
@@ -132,6 +134,9 @@ class MinimegaEmulatedVM:
     def _generate_drive_configs(self, config):
         """Create a finished configuration for each drive.
 
+        The drives are also joined into the ``path,interface,cache`` string format
+        used by minimega and stored as ``disks_str``.
+
         Note:
             The first disk is assumed to be the image for the VM.
 
@@ -146,10 +151,10 @@ class MinimegaEmulatedVM:
         """
         config_list = []
 
-        for drive in self.vm["drives"]:
+        for i, drive in enumerate(self.vm["drives"]):
             conf = {
                 "name": "drive",
-                "id": f"drv{len(config_list)}",
+                "id": f"drv{i}",
                 "file": drive["file"],
                 "path": os.path.join(self.vm["image_store"]["name"], drive["file"]),
                 "db_path": drive["db_path"],
@@ -175,6 +180,11 @@ class MinimegaEmulatedVM:
             config_list.append(conf)
 
         config["aux"]["disks"] = config_list
+        # minimega takes the drives as a single space-separated string.
+        config["aux"]["disks_str"] = " ".join(
+            f"{conf['path']},{conf['interface']},{conf['cache']}"
+            for conf in config_list
+        )
         self.log.debug(
             'VM "%s" generated %s drive configs.', self.name, len(config_list)
         )
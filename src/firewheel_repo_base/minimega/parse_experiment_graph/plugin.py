@@ -3,6 +3,8 @@ import sys
 import json
 import subprocess
 from time import sleep
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 
 from base_objects import VMEndpoint
 from minimega.emulated_entities import MinimegaEmulatedEntity
@@ -12,14 +14,54 @@ from firewheel.lib.minimega.api import minimegaAPI
 from firewheel.lib.discovery.api import discoveryAPI
 from firewheel.control.experiment_graph import AbstractPlugin
 
+LaunchPaths = namedtuple(
+    "LaunchPaths", ["minemiter", "templates", "minimega", "fw2mm", "launch_cmds"]
+)
+
+
+def get_launch_paths():
+    """Compute the paths of the tools and files which are used to launch an experiment.
+
+    All of these are fixed by the FIREWHEEL configuration.
+
+    Returns:
+        LaunchPaths: The paths to the ``minemiter`` binary, the discovery templates,
+        the minimega binary, the ``fw2mm.mm`` command file, and the
+        ``launch_cmds.mm`` command file.
+    """
+    discovery_dir = fw_config["discovery"]["install_dir"]
+    output_dir = fw_config["system"]["default_output_dir"]
+    return LaunchPaths(
+        minemiter=os.path.join(discovery_dir, "bin", "minemiter"),
+        templates=os.path.join(discovery_dir, "templates"),
+        minimega=os.path.join(fw_config["minimega"]["install_dir"], "bin", "minimega"),
+        fw2mm=os.path.join(output_dir, "fw2mm.mm"),
+        launch_cmds=os.path.join(output_dir, "launch_cmds.mm"),
+    )
+
 
 class Plugin(AbstractPlugin):
     """This Plugin parses the experiment graph to build necessary data structures which
     can be passed to `Discovery <https://github.com/sandia-minimega/discovery>`__.
     Discovery will then generate the necessary minimega commands and this Plugin will
     launch the experiment.
+
+    Attributes:
+        discovery_workers (int): The maximum number of discovery API requests which
+            are allowed to be in flight at the same time.
     """
 
+    discovery_workers = 32
+
+    def insert_network(self):
+        """Create a new network in the discovery graph.
+
+        Returns:
+            int: The network identifier (``NID``) of the new network.
+        """
+        network_ids = self.discovery_api.insert_network()
+        return network_ids[0]["NID"]
+
     def insert_vm_endpoint(self, vme_conf):
         """
         For each VM, we will create a dictionary containing all information required to
@@ -67,11 +109,7 @@ class Plugin(AbstractPlugin):
 
         # NOTE: we assume the first disk is the image
         data["image"] = vme_conf["aux"]["disks"][0]["file"]
-        disk_strs = []
-        for drive in vme_conf["aux"]["disks"]:
-            disk_str = ",".join([drive["path"], drive["interface"], drive["cache"]])
-            disk_strs.append(disk_str)
-        data["disks"] = " ".join(disk_strs)
+        data["disks"] = vme_conf["aux"]["disks_str"]
 
         # Currently, there is only support for a num_serial option
         # we need one for the qga socket
@@ -122,6 +160,9 @@ class Plugin(AbstractPlugin):
 
         Returns:
             dict: The newly updated endpoint in the discovery graph.
+
+        Raises:
+            RuntimeError: If discovery did not create an edge for every NIC.
         """
 
         try:
@@ -130,37 +171,100 @@ class Plugin(AbstractPlugin):
             return None
 
         edges = []
+        control_bridge = fw_config["minimega"]["control_bridge"]
+        connect_endpoint = self.discovery_api.connect_endpoint
         for nic in vme_conf["aux"]["nic"]:
             # Create an edge between the VM and the switch using the network identifier
             # for that switch that we created earlier with the insert network API call.
-            switch_name = nic["switch_name"]
-            switch_network_id = switch_name_to_nid[switch_name]
-            mm_endpoint = self.discovery_api.connect_endpoint(
-                mm_endpoint["NID"], switch_network_id
-            )
+            switch_network_id = switch_name_to_nid[nic["switch_name"]]
+            mm_endpoint = connect_endpoint(mm_endpoint["NID"], switch_network_id)
 
             # Create a dictionary containing this edge's attributes and hold on to it until
             # we have finished inserting all edges.
-            edge_data = {"mac": nic["mac"], "driver": nic["driver"]}
-            edge_data["bridge"] = fw_config["minimega"]["control_bridge"]
+            edge_data = {
+                "mac": nic["mac"],
+                "driver": nic["driver"],
+                "bridge": control_bridge,
+            }
 
             # QoS attributes e.g. loss, delay, rate
-            for qos_key, qos_value in nic["qos"].items():
-                if qos_value:
-                    edge_data[qos_key] = str(qos_value)
+            edge_data.update({
+                qos_key: str(qos_value)
+                for qos_key, qos_value in nic["qos"].items()
+                if qos_value
+            })
             edge = {"N": switch_network_id, "D": edge_data}
             edges.append(edge)
 
         # Now that we have (1) initialized all of the edges and (2) created a local list of updated
         # edges, we can send an updated dictionary for our endpoint containing the updated list
         # of edges to the discovery's update endpoint.
-        for eid, edge in enumerate(edges):
-            assert mm_endpoint["Edges"][eid]["N"] == edge["N"]
-            mm_endpoint["Edges"][eid]["D"] = edge["D"]
+        # Match edges on their network ID rather than their position. A VM may have
+        # several NICs on the same switch, so each ID maps to its edges in order.
+        mm_edges_by_nid = {}
+        for mm_edge in mm_endpoint["Edges"]:
+            mm_edges_by_nid.setdefault(mm_edge["N"], []).append(mm_edge)
+        mm_edges_by_nid = {
+            nid: iter(nid_edges) for nid, nid_edges in mm_edges_by_nid.items()
+        }
+        no_edges = iter(())
+        for edge in edges:
+            mm_edge = next(mm_edges_by_nid.get(edge["N"], no_edges), None)
+            if mm_edge is None:
+                raise RuntimeError(
+                    f"Discovery is missing an edge to network {edge['N']} "
+                    f'for VM "{vme_conf["vm"]["name"]}".'
+                )
+            mm_edge["D"] = edge["D"]
 
         mm_endpoint = self.discovery_api.update_endpoint(mm_node_properties=mm_endpoint)
         return mm_endpoint
 
+    def add_vm_to_discovery(self, vme_conf, switch_name_to_nid):
+        """Add a VM and all of its connections to the discovery graph.
+
+        This calls :py:meth:`insert_vm_endpoint` followed by
+        :py:meth:`make_endpoint_connections`. The requests for a single VM must
+        happen in order, but those for different VMs are independent, which lets
+        :py:meth:`run` have several VMs in flight at once.
+
+        Args:
+            vme_conf (dict): The generated minimega configuration dictionary created by
+                :ref:`minimega.emulated_entities_mc`.
+            switch_name_to_nid (dict): A dictionary of network IDs which are used by discovery.
+        """
+        mm_endpoint = self.insert_vm_endpoint(vme_conf)
+        # Then we will insert edges for each of its NICs.
+        self.make_endpoint_connections(mm_endpoint, vme_conf, switch_name_to_nid)
+
+    def minimega_read(self, minimega_bin_path, commands_path):
+        """Have the running minimega instance execute a file of commands.
+
+        Note:
+            The VM launch commands and the :ref:`vm-resource-handler` launch commands
+            cannot be combined into a single file. The latter depend on the IDs and
+            hosts which minimega assigns to the VMs once they have launched.
+
+        Args:
+            minimega_bin_path (str): The path to the minimega binary.
+            commands_path (str): The path to the file of minimega commands.
+
+        Returns:
+            int: The return code of the minimega client.
+        """
+        # Note that this uses the FIREWHEEL configuration to launch a new process
+        # if there are not access controls on this file or the user accounts there
+        # could be security concerns.
+        return subprocess.check_call(  # nosec
+            [
+                minimega_bin_path,
+                f"-base={fw_config['minimega']['base_dir']}",
+                "-e",
+                "read",
+                commands_path,
+            ]
+        )
+
     def run(self):
         """This method contains the primary logic to launch an experiment.
         It has several objectives:
@@ -177,19 +281,23 @@ class Plugin(AbstractPlugin):
         self.discovery_api = discoveryAPI()
         switch_names = set()
 
-        for vertex in self.g.get_vertices():
-            if vertex.is_decorated_by(MinimegaEmulatedEntity):
-                if vertex.is_decorated_by(VMEndpoint):
-                    try:
-                        for iface in vertex.interfaces.interfaces:
-                            switch_name = iface["switch"].name
-                            switch_names.add(switch_name)
-                    except AttributeError:
-                        self.log.debug("%s doesn't have any interfaces.", vertex.name)
+        # Collect the VMs once so the decoration checks are not repeated below.
+        vm_vertices = [
+            vertex
+            for vertex in self.g.get_vertices()
+            if vertex.is_decorated_by(MinimegaEmulatedEntity)
+            and vertex.is_decorated_by(VMEndpoint)
+        ]
+
+        for vertex in vm_vertices:
+            try:
+                for iface in vertex.interfaces.interfaces:
+                    switch_name = iface["switch"].name
+                    switch_names.add(switch_name)
+            except AttributeError:
+                self.log.debug("%s doesn't have any interfaces.", vertex.name)
 
         switch_name_to_nid = {}
-        switch_names = set(switch_names)
-        original_switch_len = len(switch_names)
         # if there is a control network, insert one
         try:
             assert self.g.control_net["name"]
@@ -199,77 +307,78 @@ class Plugin(AbstractPlugin):
             self.control_net = False
 
         if self.control_net and self.control_net in switch_names:
-            network_ids = self.discovery_api.insert_network()
-            network_id = network_ids[0]["NID"]
-            switch_name_to_nid[self.control_net] = network_id
+            switch_name_to_nid[self.control_net] = self.insert_network()
             switch_names.remove(self.control_net)
-            assert len(switch_names) == original_switch_len - 1
-        for sw_name in switch_names:
-            network_ids = self.discovery_api.insert_network()
-            network_id = network_ids[0]["NID"]
-            switch_name_to_nid[sw_name] = network_id
+
+        # The remaining networks are independent of each other, so issue the
+        # requests concurrently rather than waiting on each round trip in turn.
+        switch_names = list(switch_names)
+        with ThreadPoolExecutor(max_workers=self.discovery_workers) as executor:
+            futures = [executor.submit(self.insert_network) for _ in switch_names]
+            for sw_name, future in zip(switch_names, futures):
+                switch_name_to_nid[sw_name] = future.result()
         num_vms = 0
-        vme_confs = {}
-        for vertex in self.g.get_vertices():
-            if vertex.is_decorated_by(MinimegaEmulatedEntity):
-                if vertex.is_decorated_by(VMEndpoint):
-                    # For each VM, we will add it to the discovery graph
-                    # using the insert_endpoint API call.
-                    vme_conf = vertex.generate_minimega_config()
-                    vme_confs[vertex.name] = vme_conf
-                    num_vms += 1
-                    mm_endpoint = self.insert_vm_endpoint(vme_conf)
-                    # Then we will insert edges for each of its NICs.
-                    mm_endpoint = self.make_endpoint_connections(
-                        mm_endpoint, vme_conf, switch_name_to_nid
+        # Only the handler process configs are needed once the VMs are in the
+        # discovery graph, so avoid holding every full VM config in memory.
+        handler_processes = {}
+        with ThreadPoolExecutor(max_workers=self.discovery_workers) as executor:
+            futures = []
+            for vertex in vm_vertices:
+                # The config is generated here as it modifies the vertex, but adding
+                # it to the discovery graph happens in the background.
+                vme_conf = vertex.generate_minimega_config()
+                try:
+                    handler_processes[vertex.name] = vme_conf["aux"]["handler_process"]
+                except KeyError:
+                    self.log.debug("no process_config for %s", vertex.name)
+                num_vms += 1
+                futures.append(
+                    executor.submit(
+                        self.add_vm_to_discovery, vme_conf, switch_name_to_nid
                     )
+                )
+            # Surface any errors from the discovery requests.
+            for future in futures:
+                future.result()
 
         self.discovery_api.set_config("queueing", "true")
 
-        minemiter_path = os.path.join(
-            fw_config["discovery"]["install_dir"], "bin", "minemiter"
-        )
-        template_path = os.path.join(fw_config["discovery"]["install_dir"], "templates")
-        minimega_bin_path = os.path.join(
-            fw_config["minimega"]["install_dir"], "bin", "minimega"
-        )
-        fw2mm_path = os.path.join(fw_config["system"]["default_output_dir"], "fw2mm.mm")
+        paths = get_launch_paths()
         # Note that this uses the FIREWHEEL configuration to launch a new process
         # if there are not access controls on this file or the user accounts there
         # could be security concerns.
         minemiter_ret = subprocess.check_call(  # nosec
             [
-                minemiter_path,
+                paths.minemiter,
                 "-path",
-                template_path,
+                paths.templates,
                 "-w",
-                fw2mm_path,
+                paths.fw2mm,
                 "-server",
                 self.discovery_api.bind_addr,
             ]
         )
         self.log.debug("minemiter_ret=%s", minemiter_ret)
-        # Note that this uses the FIREWHEEL configuration to launch a new process
-        # if there are not access controls on this file or the user accounts there
-        # could be security concerns.
-        launch_vms_ret = subprocess.check_call(  # nosec
-            [
-                minimega_bin_path,
-                f"-base={fw_config['minimega']['base_dir']}",
-                "-e",
-                "read",
-                fw2mm_path,
-            ]
-        )
+        launch_vms_ret = self.minimega_read(paths.minimega, paths.fw2mm)
         self.log.debug("launch_vms_ret=%s", launch_vms_ret)
 
-        # Wait for all VMs to launch.
+        # Wait for all VMs to launch. Poll quickly at first so that fast launches
+        # are not held up, then back off so that minimega is not flooded.
         vm_map = {}
         mm_api = minimegaAPI()
         all_vms_launched = False
         core_vms = None
-        for i in range(100):
-            sleep(0.5)
+        # Budget on the time spent sleeping rather than wall-clock time, as each
+        # ``mm_vms()`` call can take several seconds on large experiments. This
+        # allows slightly more polls than the previous 100 sleeps of 0.5 seconds.
+        delay = 0.01
+        sleep_budget = 50
+        i = 0
+        while not all_vms_launched and sleep_budget > 0:
+            sleep(delay)
+            sleep_budget -= delay
+            delay = min(delay * 2, 0.5)
+            i += 1
             try:
                 core_vms = mm_api.mm_vms()
                 found_vms = len(core_vms)
@@ -284,14 +393,10 @@ class Plugin(AbstractPlugin):
             # Unknown errors could be returned from minimega
             # so catch all possibilities.
             except Exception:
-                self.log.debug(
+                self.log.exception(
                     "Iteration num=%s. Waiting for vm configs from minimega: exception",
                     i,
                 )
-                self.log.exception()
-                continue
-            if all_vms_launched:
-                break
 
         assert all_vms_launched
 
@@ -302,29 +407,29 @@ class Plugin(AbstractPlugin):
         for vm_name, vm in core_vms.items():
             vm_map[vm_name] = vm["hostname"]
 
+        mm_base = mm_api.mm_base
+
         def update_socket_path(process_config):
             original_socket_path = process_config["path"]
             socket_filename = os.path.basename(original_socket_path)
             mm_id = core_vms[process_config["vm_name"]]["id"]
-            full_socket_path = os.path.join(mm_api.mm_base, mm_id, socket_filename)
+            full_socket_path = f"{mm_base}/{mm_id}/{socket_filename}"
             process_config["path"] = full_socket_path
 
         # Launch the vm_resource_handlers.
         launch_cmds = []
-        for vm_name, vme_conf in vme_confs.items():
-            try:
-                process_config = vme_conf["aux"]["handler_process"]
-            except KeyError:
-                self.log.debug("no process_config for %s", vm_name)
-                continue
+        # Run the VM Resource Handler with the correct python path
+        binary_name = sys.executable
+        head_node = mm_api.cluster_head_node
+        # json.dumps builds a new encoder for every call when given options,
+        # so create a single one for all of the handlers.
+        encode_handler_args = json.JSONEncoder(separators=(",", ":")).encode
+        for vm_name, process_config in handler_processes.items():
             hostname = vm_map[vm_name]
-
-            # Run the VM Resource Handler with the correct python path
-            binary_name = sys.executable
             handler_path = process_config["binary_name"]
             update_socket_path(process_config)
-            handler_args = json.dumps(process_config, separators=(",", ":"))
-            if mm_api.cluster_head_node == hostname:
+            handler_args = encode_handler_args(process_config)
+            if head_node == hostname:
                 # need to escape once on local commands
                 handler_args = handler_args.replace('"', '\\"')
                 launch_cmd = f"background {binary_name} {handler_path} '{handler_args}'"
@@ -336,22 +441,9 @@ class Plugin(AbstractPlugin):
                     f"{handler_path} '{handler_args}'"
                 )
             launch_cmds.append(launch_cmd)
-        launch_cmds_path = os.path.join(
-            fw_config["system"]["default_output_dir"], "launch_cmds.mm"
-        )
-        with open(launch_cmds_path, "w", encoding="UTF-8") as f_hand:
-            for launch_cmd in launch_cmds:
-                f_hand.write(launch_cmd + "\n")
-        # Note that this uses the FIREWHEEL configuration to launch a new process
-        # if there are not access controls on this file or the user accounts there
-        # could be security concerns.
-        launch_handlers_ret = subprocess.check_call(  # nosec
-            [
-                minimega_bin_path,
-                f"-base={fw_config['minimega']['base_dir']}",
-                "-e",
-                "read",
-                launch_cmds_path,
-            ]
-        )
+        # The commands are read by the minimega daemon rather than this process,
+        # so they need to be in a file which it can access.
+        with open(paths.launch_cmds, "w", encoding="UTF-8") as f_hand:
+            f_hand.write("".join(f"{launch_cmd}\n" for launch_cmd in launch_cmds))
+        launch_handlers_ret = self.minimega_read(paths.minimega, paths.launch_cmds)
         self.log.debug("launch_handlers_ret=%s", launch_handlers_ret)
@@ -24,40 +24,33 @@ class ResolveVMImages(AbstractPlugin):
         assign an image if one hasn't been assigned already. If a type is not specified for an
         endpoint, use ``"host"``. Default images are specified based on the type property.
         """
+        image_store_path = self.image_store.cache
+        image_store_name = self.image_store.store
+        default_images = self.default_images
         for v in self.g.get_vertices():
             if v.is_decorated_by(VMEndpoint):
-                v.vm["image_store"] = {
-                    "path": self.image_store.cache,
-                    "name": self.image_store.store,
+                vm = v.vm
+                vm["image_store"] = {
+                    "path": image_store_path,
+                    "name": image_store_name,
                 }
-                has_image = False
-                try:
-                    image_name = v.vm["image"]
-                    if image_name:
-                        has_image = True
-                except AttributeError:
-                    self.log.debug('Assigning default image to VM "%s".', v.name)
-                except KeyError:
-                    has_image = False
 
-                if not has_image:
-                    # Assign a default image.
-                    try:
-                        # Based on v.type
-                        v.decorate(self.default_images[v.type])
-                    except AttributeError:
-                        # We have no type. Just make a default host.
-                        # We already know this is a VMEndpoint.
-                        v.decorate(self.default_images["host"])
-                    except KeyError:
+                if not vm.get("image"):
+                    # Assign a default image based on v.type. If we have no type,
+                    # just make a default host. We already know this is a VMEndpoint.
+                    self.log.debug('Assigning default image to VM "%s".', v.name)
+                    default_image = default_images.get(getattr(v, "type", "host"))
+                    if default_image is None:
                         # Unknown type.
                         self.log.warning(
                             'Encountered unknown type for VM "%s". Cannot assign a default image.',
                             v.name,
                         )
                         continue
+                    v.decorate(default_image)
                 # We currently only handle minimega VMs.
-                v.decorate(MinimegaEmulatedVM)
+                if not v.is_decorated_by(MinimegaEmulatedVM):
+                    v.decorate(MinimegaEmulatedVM)
 
     def run(self):
         """
@@ -22,11 +22,15 @@ class SendMiniwebArp(AbstractPlugin):
     def run(self):
         """
         Schedule the ping command on all VMs.
+
+        Note:
+            Scheduling only adds an entry to each VM's in-memory schedule. The schedules
+            are stored in a single batch by :ref:`vm_resource.schedule_mc`.
         """
+        args = "-w 1 192.0.2.1 > NULL"
         for vertex in self.g.get_vertices():
             if vertex.is_decorated_by(VMEndpoint):
                 try:
-                    args = "-w 1 192.0.2.1 > NULL"
                     vertex.run_executable(-1, "ping", arguments=args)
                 except AttributeError:
                     pass
@@ -31,17 +31,24 @@ def convert_nx_to_fw(nx_graph, fw_graph):
     :py:class:`Vertex <firewheel.control.experiment_graph.Vertex>` and
     :py:class:`Edge <firewheel.control.experiment_graph.Edge>` called ``nx_data``.
 
+    Note:
+        ``nx_data`` references the NetworkX attribute dictionary rather than a copy of it.
+        Therefore, changes made through either graph will be visible in the other.
+
     Args:
         nx_graph (networkx.Graph): The :py:class:`networkx.Graph` to convert.
         fw_graph (ExperimentGraph): The FIREWHEEL
             :py:class:`firewheel.control.experiment_graph.ExperimentGraph` where
             the new nodes/edges will be added.
     """
+    # Keep track of the new Vertices so that edges do not need to search the graph.
+    id_to_vertex = {}
     for node, data in nx_graph.nodes(data=True):
         fw_node = Vertex(fw_graph, name=node, graph_id=node)
         fw_node.nx_data = data
+        id_to_vertex[node] = fw_node
 
     for src, dst, data in nx_graph.edges(data=True):
-        edge = Edge(fw_graph.find_vertex_by_id(src), fw_graph.find_vertex_by_id(dst))
+        edge = Edge(id_to_vertex[src], id_to_vertex[dst])
         edge.decorate(NxEdge)
         edge.nx_data = data
@@ -6,6 +6,41 @@ import networkx as nx
 
 from firewheel.control.experiment_graph import AbstractPlugin
 
+# The Vertex/Edge attributes which are included in the NetworkX graph.
+_NODE_ATTRS = frozenset({
+    "vm",
+    "vm_resource_schedule",
+    "host",
+    "type",
+    "nx_data",
+    "interfaces",
+})
+_EDGE_ATTRS = frozenset({"dst_ip", "dst_network", "qos"})
+
+# The GEXF visualization settings for each type of Vertex. These are shared by
+# every node of that type and must not be modified.
+_VIZ_BY_TYPE = {
+    "switch": {
+        "viz": {
+            "color": {"a": 0.5, "r": 255, "g": 255, "b": 0},
+            "shape": "triangle",
+        }
+    },
+    "host": {
+        "viz": {
+            "color": {"a": 0.5, "r": 255, "g": 0, "b": 255},
+            "shape": "square",
+        }
+    },
+    "router": {
+        "viz": {
+            "color": {"a": 0.5, "r": 0, "g": 255, "b": 255},
+            "shape": "disc",
+        }
+    },
+}
+_NO_VIZ = {}
+
 
 class PrintGraph(AbstractPlugin):
     """
@@ -46,77 +81,56 @@ class PrintGraph(AbstractPlugin):
                 :py:class:`ExperimentGraph <firewheel.control.experiment_graph.ExperimentGraph>`.
         """
 
-        print_graph = nx.Graph()
+        isroutine = inspect.isroutine
+        # Many objects share the same decorators, so only build each list of names once.
+        dec_cache = {}
+
+        def get_dec_names(decorators):
+            key = tuple(decorators)
+            dec_names = dec_cache.get(key)
+            if dec_names is None:
+                dec_names = ", ".join([dec.__name__ for dec in key])
+                dec_cache[key] = dec_names
+            return dec_names
+
+        # Gather everything first so that NetworkX can add it in bulk.
+        nodes = []
         for v in self.g.get_vertices():
             # Get decorators
-            dec_names = ", ".join([str(dec.__name__) for dec in v.decorators])
+            attrs = {
+                "graph_id": v.graph_id,
+                "decorated_by": get_dec_names(v.decorators),
+            }
 
             # Get attributes
-            attributes = []
-            for attr in v.__dict__.keys():
-                if inspect.isroutine(v.__dict__[attr]):
-                    continue
-                attributes.append(attr)
-
-            attrs = {}
-            for attribute in attributes:
-                if str(attribute) not in {
-                    "vm",
-                    "vm_resource_schedule",
-                    "host",
-                    "type",
-                    "nx_data",
-                    "interfaces",
-                }:
+            for attr, value in v.__dict__.items():
+                if attr not in _NODE_ATTRS or isroutine(value):
                     continue
-                attrs[str(attribute)] = str(v.__dict__[attribute])
-
-            node_char = {}
-            if v.type == "switch":
-                node_char["viz"] = {
-                    "color": {"a": 0.5, "r": 255, "g": 255, "b": 0},
-                    "shape": "triangle",
-                }
-            if v.type == "host":
-                node_char["viz"] = {
-                    "color": {"a": 0.5, "r": 255, "g": 0, "b": 255},
-                    "shape": "square",
-                }
-            if v.type == "router":
-                node_char["viz"] = {
-                    "color": {"a": 0.5, "r": 0, "g": 255, "b": 255},
-                    "shape": "disc",
-                }
-
-            print_graph.add_node(
-                v.name,
-                graph_id=v.graph_id,
-                decorated_by=dec_names,
-                **attrs,
-                **node_char,
-            )
+                attrs[attr] = str(value)
+
+            attrs.update(_VIZ_BY_TYPE.get(v.type, _NO_VIZ))
+            nodes.append((v.name, attrs))
 
+        edges = []
         for edge in self.g.get_edges():
-            # Get attributes
-            attributes = []
-            for attr in edge.__dict__.keys():
-                if inspect.isroutine(edge.__dict__[attr]):
-                    continue
-                attributes.append(attr)
+            # Get decorators
+            attrs = {"decorated_by": get_dec_names(edge.decorators)}
 
-            attrs = {}
-            for attribute in attributes:
-                if str(attribute) not in {"dst_ip", "dst_network", "qos"}:
+            # Get attributes
+            for attr, value in edge.__dict__.items():
+                if attr not in _EDGE_ATTRS or isroutine(value):
                     continue
-                attrs[str(attribute)] = str(edge.__dict__[attribute])
+                attrs[attr] = str(value)
 
-            print_graph.add_edge(
+            edges.append((
                 edge.source["object"].name,
                 edge.destination["object"].name,
-                decorated_by=", ".join([str(dec.__name__) for dec in edge.decorators]),
-                **attrs,
-            )
+                attrs,
+            ))
 
+        print_graph = nx.Graph()
+        print_graph.add_nodes_from(nodes)
+        print_graph.add_edges_from(edges)
         return print_graph
 
     def _generate_text(self):
@@ -139,43 +153,49 @@ class PrintGraph(AbstractPlugin):
             str: The properly formatted text representation of the
                 :py:class:`ExperimentGraph <firewheel.control.experiment_graph.ExperimentGraph>`.
         """
-        text = ""
+        # Collect the pieces and join them once at the end. Repeatedly concatenating
+        # onto a single string can be quadratic for large graphs.
+        text = []
+        isroutine = inspect.isroutine
+        # Many vertices share the same decorators, so only sort each set of names once.
+        dec_cache = {}
 
         for v in self.g.get_vertices():
-            text += f"NODE {v.graph_id!s}\n"
+            text.append(f"NODE {v.graph_id!s}\n")
 
-            dec_names = [str(dec.__name__) for dec in v.decorators]
-            dec_names.sort()
-            text += f"  DECORATED BY: {' '.join(dec_names)}\n"
+            dec_key = tuple(v.decorators)
+            dec_names = dec_cache.get(dec_key)
+            if dec_names is None:
+                dec_names = " ".join(sorted([dec.__name__ for dec in dec_key]))
+                dec_cache[dec_key] = dec_names
+            text.append(f"  DECORATED BY: {dec_names}\n")
 
-            text += "  NEIGHBORS:\n"
+            text.append("  NEIGHBORS:\n")
             for neighbor in v.get_neighbors():
-                text += f"    {neighbor.graph_id!s}\n"
+                text.append(f"    {neighbor.graph_id!s}\n")
 
             attributes = []
             methods = []
 
-            for attr in v.__dict__.keys():
-                if inspect.isroutine(v.__dict__[attr]):
+            for attr, value in v.__dict__.items():
+                if isroutine(value):
                     methods.append(attr)
                 else:
-                    attributes.append(attr)
+                    attributes.append((attr, value))
 
-            text += "  ATTRIBUTES:\n"
-            for attribute in attributes:
-                attr_str = str(v.__dict__[attribute])
+            text.append("  ATTRIBUTES:\n")
+            for attribute, value in attributes:
+                attr_str = str(value)
                 attr_split = attr_str.strip().split("\n")
-                if len(attr_split) > 1:
-                    attr_str = "\n"
-                    for line in attr_split:
-                        attr_str += f"      {line.strip()}\n"
-                text += f"    {attribute!s}: {attr_str.strip()}\n"
+                # Multi-line values are indented beneath the attribute name.
+                attr_str = "\n      ".join(line.strip() for line in attr_split)
+                text.append(f"    {attribute!s}: {attr_str}\n")
 
-            text += "  METHODS:\n"
+            text.append("  METHODS:\n")
             for method in methods:
-                text += f"    {method!s}\n"
+                text.append(f"    {method!s}\n")
 
-        return text
+        return "".join(text)
 
     def run(self, output_file=""):
         """
@@ -191,7 +211,10 @@ class PrintGraph(AbstractPlugin):
                 Otherwise will use text format. Defaults to ``""``.
         """
         if Path(output_file).suffix.lower() == ".gexf":
-            nx.write_gexf(self._generate_nx_graph(), output_file)
+            # NetworkX serializes the tree straight to the file handle; a large
+            # buffer keeps the number of small writes down for big graphs.
+            with open(output_file, "wb", buffering=1 << 20) as out:
+                nx.write_gexf(self._generate_nx_graph(), out)
         elif output_file:
             rich.print(
                 "[b yellow]Unknown [cyan]print_graph[/cyan] file extension provided, "
@@ -1,5 +1,6 @@
 import json
 from pathlib import Path
+from collections import defaultdict
 
 import rich
 
@@ -22,7 +23,7 @@ class PrintSchedule(AbstractPlugin):
             dict: The sorted dictionary of schedule entries.
         """
 
-        full_schedule = {}
+        full_schedule = defaultdict(list)
         for vert in self.g.get_vertices():
             vm_schedule = vert.__dict__.get("vm_resource_schedule", None)
 
@@ -31,7 +32,6 @@ class PrintSchedule(AbstractPlugin):
 
             # Iterate over schedule
             for entry in vm_schedule.get_schedule():
-                full_schedule[entry.start_time] = full_schedule.get(entry.start_time, [])
                 full_schedule[entry.start_time].append({
                     "name": vert.name,
                     "executable": entry.executable,
@@ -40,7 +40,7 @@ class PrintSchedule(AbstractPlugin):
                     "pause": entry.pause,
                 })
 
-        return dict(sorted(full_schedule.items()))
+        return {start: full_schedule[start] for start in sorted(full_schedule)}
 
     def run(self, output_file=""):
         """
@@ -53,8 +53,11 @@ class PrintSchedule(AbstractPlugin):
         """
         schedule = self._generate_schedule()
         if output_file:
+            # Serialize up front so the file is written in a single call rather
+            # than one small write per JSON token.
+            payload = json.dumps(schedule, separators=(",", ":"))
             with open(output_file, "w", encoding="UTF-8") as out:
-                json.dump(schedule, out)
+                out.write(payload)
             rich.print(
                 "[b yellow]Output experiment schedule to: "
                 f"[magenta]{Path(output_file).absolute()!s}"
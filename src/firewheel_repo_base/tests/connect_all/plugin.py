@@ -31,16 +31,18 @@ class Plugin(AbstractPlugin):
         if num_nets >= 255 or num_nets <= 0:
             raise RuntimeError("The number of networks must be between [1-254].")
 
+        # Find the VMs once rather than for every network.
+        vms = [v for v in self.g.get_vertices() if v.is_decorated_by(VMEndpoint)]
+
         if num_nets >= 10:
             scaling_factor = num_nets // 20 + 1
-            for v in self.g.get_vertices():
-                if v.is_decorated_by(VMEndpoint):
-                    try:
-                        v.vm["mem"] = 1024 * scaling_factor
-                        v.vm["vcpu"] = {"sockets": 4, "cores": 1, "threads": 1}
-                    except AttributeError:
-                        v.vm = {"mem": 1024 * scaling_factor}
-                        v.vm["vcpu"] = {"sockets": 4, "cores": 1, "threads": 1}
+            for v in vms:
+                try:
+                    v.vm["mem"] = 1024 * scaling_factor
+                    v.vm["vcpu"] = {"sockets": 4, "cores": 1, "threads": 1}
+                except AttributeError:
+                    v.vm = {"mem": 1024 * scaling_factor}
+                    v.vm["vcpu"] = {"sockets": 4, "cores": 1, "threads": 1}
         for net in range(1, num_nets + 1):
             # Create our switch
             switch = Vertex(self.g, f"switch-{net}")
@@ -51,8 +53,12 @@ class Plugin(AbstractPlugin):
                 network = netaddr.IPNetwork(f"{net}::/16")
             else:
                 network = netaddr.IPNetwork(f"{net}.0.0.0/8")
-            ips = network.iter_hosts()
 
-            for v in self.g.get_vertices():
-                if v.is_decorated_by(VMEndpoint):
-                    v.connect(switch, next(ips), network.netmask)
+            # Derive each host address from the integer value of the network
+            # rather than walking the (much slower) ``iter_hosts()`` generator.
+            # The first address is skipped, just as ``iter_hosts()`` would.
+            first_host = network.first + 1
+            version = network.version
+            netmask = network.netmask
+            for i, v in enumerate(vms):
+                v.connect(switch, netaddr.IPAddress(first_host + i, version), netmask)
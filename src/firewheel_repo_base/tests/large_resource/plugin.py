@@ -1,10 +1,15 @@
 import os
+import hashlib
+from pathlib import Path
 
 from base_objects import VMEndpoint, AbstractWindowsEndpoint
 
-from firewheel.lib.utilities import hash_file, strtobool
+from firewheel.lib.utilities import strtobool
 from firewheel.control.experiment_graph import AbstractPlugin
 
+# The directory which holds this model component's VM resources.
+_VMR_DIR = Path(__file__).resolve().parent / "vm_resources"
+
 
 class Plugin(AbstractPlugin):
     """
@@ -26,24 +31,33 @@ class Plugin(AbstractPlugin):
 
         size = int(size)
         preload = bool(strtobool(preload))
-        current_module_path = os.path.abspath(os.path.dirname(__file__))
         filename = "test_random_data.bin"
-        path = os.path.join(current_module_path, "vm_resources", filename)
+        path = _VMR_DIR / filename
 
         # Create the binary file.
         # Only write 100MB at a time to prevent blocking when creating huge files.
+        # The same random bytes are reused for every chunk, including the remainder.
+        # The file is hashed as it is written rather than being read back afterwards.
+        # This must match the hash computed by ``hash_compare.py``, which is not used
+        # in any security context.
+        hash_func = hashlib.sha1()  # noqa: S324
+        loop_size = 104857600  # This equals 100MB
+        random_bytes = os.urandom(min(size, loop_size))
+        num_chunks, remainder = divmod(size, loop_size)
         with open(path, "wb") as fout:
-            loop_size = 104857600  # This equals 100MB
-            random_bytes = os.urandom(loop_size)
-            while True:
-                if size < loop_size:
-                    fout.write(os.urandom(size))
-                    break
+            # Have the filesystem allocate the whole file at once, where supported.
+            try:
+                os.posix_fallocate(fout.fileno(), 0, size)
+            except (AttributeError, OSError):
+                pass
+            for _ in range(num_chunks):
                 fout.write(random_bytes)
-                size -= loop_size
+                hash_func.update(random_bytes)
+            remainder_bytes = memoryview(random_bytes)[:remainder]
+            fout.write(remainder_bytes)
+            hash_func.update(remainder_bytes)
 
-        # Get the hash of the file
-        pre_hash = hash_file(path)
+        pre_hash = hash_func.hexdigest()
 
         # Add the binary to all VMs
         for v in self.g.get_vertices():
@@ -1,9 +1,9 @@
 #!/usr/bin/env python3
 
-import os
 import sys
 import json
 import hashlib
+from pathlib import Path
 
 
 def hash_file(fname):
@@ -12,7 +12,10 @@ def hash_file(fname):
     https://stackoverflow.com/a/3431838.
     Through various performance tests, we found that SHA1 is currently the fastest
     hashlib function. We also found that SHA-1 performance improved by using a
-    chunk size of 1048576.
+    chunk size of 1048576. Each chunk is read into the same buffer to avoid
+    allocating a new one for every read.
+    Note that this must remain compatible with the older versions of Python
+    available on some VMs (e.g., the walrus operator and BLAKE2 cannot be used).
 
     Args:
         fname (str): The name of the file to hash.
@@ -23,9 +26,11 @@ def hash_file(fname):
     # The following hash is not used in any security context and
     # collisions are acceptable.
     hash_func = hashlib.sha1()  # noqa: S324
-    with open(fname, "rb") as fopened:
-        for chunk in iter(lambda: fopened.read(1048576), b""):
-            hash_func.update(chunk)
+    buf = bytearray(1048576)
+    view = memoryview(buf)
+    with open(fname, "rb", buffering=0) as fopened:
+        for num_read in iter(lambda: fopened.readinto(buf), 0):
+            hash_func.update(view[:num_read])
     return hash_func.hexdigest()
 
 
@@ -38,21 +43,12 @@ if __name__ == "__main__":
     PREV_HASH = sys.argv[2]
 
     # We need a standard path for the status file
-    STATUS_FILE = "/tmp/status"  # noqa: S108
+    STATUS_FILE = Path("/tmp/status")  # noqa: S108
 
     CURR_HASH = hash_file(PATH)
 
-    TEST_PASS = False
-    if CURR_HASH == PREV_HASH:
-        TEST_PASS = True
+    RESULT = "pass" if CURR_HASH == PREV_HASH else "fail"
 
-    if not os.path.exists(os.path.dirname(STATUS_FILE)):
-        os.makedirs(os.path.dirname(STATUS_FILE))
-
-    with open(STATUS_FILE, "w", encoding="utf-8") as fhand:
-        if TEST_PASS is True:
-            fhand.write("pass")
-            print(json.dumps({"test": "pass"}))
-        else:
-            fhand.write("fail")
-            print(json.dumps({"test": "fail"}))
+    STATUS_FILE.parent.mkdir(parents=True, exist_ok=True)
+    STATUS_FILE.write_text(RESULT, encoding="utf-8")
+    print(json.dumps({"test": RESULT}))
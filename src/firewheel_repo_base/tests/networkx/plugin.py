@@ -1,3 +1,8 @@
+import os
+import json
+import stat
+from pathlib import Path
+
 import netaddr
 import networkx as nx
 from base_objects import Switch
@@ -5,6 +10,7 @@ from misc.networkx import NxEdge, convert_nx_to_fw
 from linux.ubuntu2204 import Ubuntu2204Server
 from generic_vm_objects import GenericRouter
 
+from firewheel.config import config as fw_config
 from firewheel.lib.utilities import strtobool
 from firewheel.control.experiment_graph import Vertex, AbstractPlugin
 
@@ -17,7 +23,7 @@ class Plugin(AbstractPlugin):
     topology which creates a random undirected graph resembling the Internet AS network.
     """
 
-    def run(self, num_nodes="100", del_edges="False"):
+    def run(self, num_nodes="100", del_edges="False", seed=""):
         """
         Run method documentation which takes the NetworkX graph and
         converts it to FIREWHEEL.
@@ -29,6 +35,10 @@ class Plugin(AbstractPlugin):
                 that are decorated with :py:class:`NxEdge`. This is particularly
                 useful for visualizing the graph structure.
                 This should be convertible to an :py:data:`bool`.
+            seed (str): An optional seed for the random graph generator.
+                This should be convertible to an :py:data:`int`. When provided,
+                the generated graph is cached on disk and reused by subsequent
+                runs with the same number of nodes and seed.
 
         Raises:
             RuntimeError: If the input parameters are improperly formatted.
@@ -40,10 +50,15 @@ class Plugin(AbstractPlugin):
         except (TypeError, ValueError) as exc:
             raise RuntimeError("The number of nodes should be an integer") from exc
 
+        try:
+            seed = int(seed) if seed else None
+        except (TypeError, ValueError) as exc:
+            raise RuntimeError("The seed should be an integer") from exc
+
         del_edges = strtobool(del_edges)
 
         # Create the random graph with the specified number of nodes
-        nx_inet = nx.random_internet_as_graph(num_nodes)
+        nx_inet = self._get_inet_graph(num_nodes, seed)
 
         # Convert the NetworkX graph to FIREWHEEL Vertices/Edges
         convert_nx_to_fw(nx_inet, self.g)
@@ -59,24 +74,31 @@ class Plugin(AbstractPlugin):
         tier_prefix = "Tier1"
         mid_prefix = "mid-level"
         cus_prefix = "customer"
+        # Track each node's role as it is decorated so that the edges can be
+        # classified with set lookups rather than repeated decorator checks.
+        routers = set()
+        ubuntus = set()
         for node in self.g.get_vertices():
             # For each node, rename it and decorate it with the correct
             # VM object
             if node.nx_data["type"] == "T":
                 node.name = f"{tier_prefix}-{node.graph_id}"
                 node.decorate(GenericRouter)
+                routers.add(node)
                 # Setting the AS number for this router
                 node.set_bgp_as(next(as_nums))
 
             if node.nx_data["type"] == "M":
                 node.name = f"{mid_prefix}-{node.graph_id}"
                 node.decorate(GenericRouter)
+                routers.add(node)
                 # Setting the AS number for this router
                 node.set_bgp_as(next(as_nums))
 
             if node.nx_data["type"] == "C" or node.nx_data["type"] == "CP":
                 node.name = f"{cus_prefix}-{node.graph_id}"
                 node.decorate(Ubuntu2204Server)
+                ubuntus.add(node)
 
         # Create different networks for each layer-3 connection
         # Internet networks, creates 65536 different networks
@@ -93,27 +115,27 @@ class Plugin(AbstractPlugin):
         # Therefore, let's use a dictionary for the router to hold all associated customers.
         customer_edges = {}
 
+        # Keep track of the NetworkX edges in case they should be removed later.
+        nx_edges = []
+
         # Search of edges that should be modified
         for edge in self.g.get_edges():
             # Ignore non NetworkX edges
             if not edge.is_decorated_by(NxEdge):
                 continue
+            nx_edges.append(edge)
 
             # Check if both the source and destination are routers
-            if edge.source.is_decorated_by(GenericRouter):
-                if edge.destination.is_decorated_by(GenericRouter):
+            if edge.source in routers:
+                if edge.destination in routers:
                     router_edges.append(edge)
                 else:
                     # If the destination is not a router, it must be a customer
-                    cust_list = customer_edges.get(edge.source, [])
-                    cust_list.append(edge.destination)
-                    customer_edges[edge.source] = cust_list
+                    customer_edges.setdefault(edge.source, []).append(edge.destination)
             # If the source is Ubuntu, see if it's peer is a router
-            elif edge.source.is_decorated_by(Ubuntu2204Server):
-                if edge.destination.is_decorated_by(GenericRouter):
-                    cust_list = customer_edges.get(edge.destination, [])
-                    cust_list.append(edge.source)
-                    customer_edges[edge.source] = cust_list
+            elif edge.source in ubuntus:
+                if edge.destination in routers:
+                    customer_edges.setdefault(edge.destination, []).append(edge.source)
 
         # Now we should iterate over all of the edges we should add/modify
         for edge in router_edges:
@@ -155,9 +177,85 @@ class Plugin(AbstractPlugin):
         # If we want to remove all NxEdges to better help visualize the graph
         # we can do that now
         if del_edges:
-            rm_list = []
-            for edge in self.g.get_edges():
-                if edge.is_decorated_by(NxEdge):
-                    rm_list.append(edge)
-            for edge in rm_list:
+            for edge in nx_edges:
                 edge.delete()
+
+    def _get_inet_graph(self, num_nodes, seed):
+        """
+        Generate the random Internet AS graph.
+
+        Generating large graphs is slow, so seeded graphs are cached on disk
+        and loaded on subsequent runs. Unseeded graphs are always regenerated
+        as they are expected to differ between runs. The cache only stores the
+        nodes, edges, and their attributes as JSON and is keyed by the NetworkX
+        version, as the generator may change between releases.
+
+        Args:
+            num_nodes (int): The number of nodes in the network.
+            seed (int): The seed for the random graph generator or :py:data:`None`.
+
+        Returns:
+            networkx.Graph: The random Internet AS graph.
+        """
+        if seed is None:
+            return nx.random_internet_as_graph(num_nodes)
+
+        cache_dir = self._get_cache_dir()
+        if cache_dir is None:
+            return nx.random_internet_as_graph(num_nodes, seed=seed)
+
+        cache_path = cache_dir / f"random_as_{nx.__version__}_{num_nodes}_{seed}.json"
+        try:
+            data = json.loads(cache_path.read_text(encoding="utf-8"))
+            nx_inet = nx.Graph()
+            nx_inet.add_nodes_from((node, attrs) for node, attrs in data["nodes"])
+            nx_inet.add_edges_from((u, v, attrs) for u, v, attrs in data["edges"])
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        else:
+            return nx_inet
+
+        nx_inet = nx.random_internet_as_graph(num_nodes, seed=seed)
+        data = {
+            "nodes": list(nx_inet.nodes(data=True)),
+            "edges": list(nx_inet.edges(data=True)),
+        }
+
+        # Write to a temporary file first so that concurrent runs never
+        # read a partially written cache.
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        try:
+            tmp_path.write_text(json.dumps(data), encoding="utf-8")
+            tmp_path.replace(cache_path)
+        except OSError:
+            self.log.warning("Unable to cache the generated graph at %s", cache_path)
+        return nx_inet
+
+    def _get_cache_dir(self):
+        """
+        Get the directory used to cache generated graphs.
+
+        The directory is created within FIREWHEEL's output directory and must be
+        owned by, and only writable by, the current user. Otherwise, another user
+        could plant a graph in the cache.
+
+        Returns:
+            pathlib.Path: The cache directory or :py:data:`None` if there is no
+            suitable directory.
+        """
+        cache_dir = Path(fw_config["system"]["default_output_dir"]) / "networkx_cache"
+        try:
+            cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+            dir_stat = cache_dir.lstat()
+        except OSError:
+            self.log.warning("Unable to create the graph cache at %s", cache_dir)
+            return None
+
+        if (
+            not stat.S_ISDIR(dir_stat.st_mode)
+            or dir_stat.st_uid != os.getuid()
+            or dir_stat.st_mode & 0o022
+        ):
+            self.log.warning("Not using the insecure graph cache at %s", cache_dir)
+            return None
+        return cache_dir
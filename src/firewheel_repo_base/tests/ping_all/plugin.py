@@ -29,6 +29,17 @@ class PingAll(AbstractPlugin):
         self.include_routers = bool(
             include_routers and include_routers.lower() == "true"
         )
+        # Check the decorators once and share the results between both steps.
+        # Only routers which are excluded from the test need to be tracked.
+        self.endpoints = [
+            v for v in self.g.get_vertices() if v.is_decorated_by(VMEndpoint)
+        ]
+        if self.include_routers:
+            self.routers = set()
+        else:
+            self.routers = {
+                v for v in self.endpoints if v.is_decorated_by(GenericRouter)
+            }
         ips = self._build_ip_list()
         self._populate_schedule(ips)
 
@@ -41,13 +52,12 @@ class PingAll(AbstractPlugin):
         """
         ip_list = []
 
-        for vertex in self.g.get_vertices():
-            if vertex.is_decorated_by(VMEndpoint):
-                if not self.include_routers and vertex.is_decorated_by(GenericRouter):
-                    continue
+        for vertex in self.endpoints:
+            if vertex in self.routers:
+                continue
 
-                for interface in vertex.interfaces.interfaces:
-                    ip_list.append(interface["address"])
+            for interface in vertex.interfaces.interfaces:
+                ip_list.append(str(interface["address"]))
 
         return ip_list
 
@@ -60,16 +70,13 @@ class PingAll(AbstractPlugin):
             ip_list (list): A list of IP addresses as strings. This is sent as a
                 string and passed into ``ping_all.py``.
         """
-        for vertex in self.g.get_vertices():
-            if vertex.is_decorated_by(VMEndpoint):
-                if not self.include_routers and vertex.is_decorated_by(GenericRouter):
-                    vertex.run_executable(
-                        5, "ping_all.py", arguments=" ", vm_resource=True
-                    )
-                else:
-                    vertex.run_executable(
-                        5,
-                        "ping_all.py",
-                        arguments=" ".join(str(ip) for ip in ip_list),
-                        vm_resource=True,
-                    )
+        # Every VM receives the same arguments, so only build them once.
+        ping_args = " ".join(ip_list)
+        routers = self.routers
+        for vertex in self.endpoints:
+            vertex.run_executable(
+                5,
+                "ping_all.py",
+                arguments=" " if vertex in routers else ping_args,
+                vm_resource=True,
+            )
@@ -2,11 +2,16 @@
 
 import sys
 import json
-import ipaddress
+import shutil
 import subprocess
 from time import sleep
 from pathlib import Path
-from subprocess import call
+from concurrent.futures import ThreadPoolExecutor
+
+_IS_WIN = sys.platform == "win32"
+
+# Seconds to wait before each retry of an unreachable address (2, 4, 8, 10, 10, ...).
+_RETRY_DELAYS = [min(2**attempt, 10) for attempt in range(1, 11)]
 
 
 # This class should remain Python 3.5 compatible
@@ -32,26 +37,23 @@ class PingAll:
         If all pings succeed, we pass, otherwise the test fails.
         """
         test_pass = True
-
-        for ip in self.ips:
-            ipv6 = bool(ipaddress.ip_address(ip).version == 6)
-            if sys.platform == "win32":
-                success = self.win_ping(ip, ipv6=ipv6)
-            else:
-                success = self.linux_ping(ip, ipv6=ipv6)
-            attempt = 0
-            while not success:
-                if attempt > 10:
-                    test_pass = False
-                    break
-                if sys.platform == "win32":
-                    success = self.win_ping(ip)
-                else:
-                    success = self.linux_ping(ip)
-                attempt += 1
-                print("on attempt: %d, sleeping 5 before trying" % attempt)
-                sys.stdout.flush()
-                sleep(5)
+        ips = self.ips
+        if ips and not _IS_WIN and shutil.which("fping"):
+            # A single fping process can ping every IPv4 address at once. Older
+            # versions of fping need a separate binary for IPv6, so those
+            # addresses are still pinged individually.
+            ipv4 = [ip for ip in ips if ":" not in ip]
+            ips = [ip for ip in ips if ":" in ip]
+            if ipv4:
+                test_pass, unchecked = self.fping_with_retries(ipv4)
+                # Addresses fping could not check are pinged individually.
+                ips = unchecked + ips
+
+        if ips:
+            # Each ping spends nearly all of its time waiting on the network,
+            # so ping every address concurrently.
+            with ThreadPoolExecutor(max_workers=min(64, len(ips))) as executor:
+                test_pass = all(executor.map(self.ping_with_retries, ips)) and test_pass
 
         self.status_file.parent.mkdir(exist_ok=True)
         with self.status_file.open("w", encoding="utf-8") as fhand:
@@ -62,6 +64,97 @@ class PingAll:
                 fhand.write("fail")
                 print(json.dumps({"test": "fail"}))
 
+    def ping_with_retries(self, ip):
+        """
+        Ping the given IP address, retrying with an increasing delay if unreachable.
+
+        Args:
+            ip (str): The IP address to ping.
+
+        Returns:
+            bool: Whether or not the ping eventually succeeded.
+        """
+        # Only IPv6 addresses contain colons, so there is no need to fully parse them.
+        ipv6 = ":" in ip
+        if _IS_WIN:
+            ping = self.win_ping
+        else:
+            ping = self.linux_ping
+
+        if ping(ip, ipv6=ipv6):
+            return True
+        for attempt, delay in enumerate(_RETRY_DELAYS, 1):
+            print("%s on attempt: %d, sleeping %d before trying" % (ip, attempt, delay))
+            sys.stdout.flush()
+            sleep(delay)
+            if ping(ip, ipv6=ipv6):
+                return True
+        return False
+
+    def fping_with_retries(self, ips):
+        """
+        Ping the given IPv4 addresses with ``fping``, retrying any unreachable
+        addresses with an increasing delay.
+
+        Args:
+            ips (list): The IPv4 addresses to ping.
+
+        Returns:
+            tuple: Whether or not every address checked by ``fping`` was eventually
+            reachable, and the list of addresses ``fping`` was unable to check.
+        """
+        pending = ips
+        unreachable = self.fping_batch(pending)
+        for attempt, delay in enumerate(_RETRY_DELAYS, 1):
+            if not unreachable:
+                break
+            print(
+                "%d unreachable on attempt: %d, sleeping %d before trying"
+                % (len(unreachable), attempt, delay)
+            )
+            sys.stdout.flush()
+            sleep(delay)
+            pending = unreachable
+            unreachable = self.fping_batch(pending)
+        if unreachable is None:
+            return True, pending
+        return not unreachable, []
+
+    def fping_batch(self, ips):
+        """
+        Send one ping packet to each of the given addresses using a single ``fping``
+        process. This will also timeout in 2 seconds if no response is received.
+
+        Args:
+            ips (list): The IP addresses to ping.
+
+        Returns:
+            list: The addresses which did not respond, or ``None`` if ``fping``
+            could not be used (e.g., it lacks permission to open a raw socket).
+        """
+        fping_cmd = ["fping", "-c1", "-t2000", "-q", *ips]
+        proc = subprocess.run(  # nosec
+            fping_cmd,
+            check=False,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+        )
+        # fping exits with 1 if any host is unreachable and 2 if any address is
+        # invalid. Anything higher means fping itself failed.
+        if proc.returncode > 2:
+            return None
+
+        # The summary for each address looks like: "10.0.0.1 : xmt/rcv/%loss = 1/1/0%"
+        reached = set()
+        for line in proc.stderr.splitlines():
+            host, _, stats = line.partition(" : ")
+            counts = stats.partition("= ")[2].split("/")
+            if len(counts) > 1 and counts[1] != "0":
+                reached.add(host.strip())
+        return [ip for ip in ips if ip not in reached]
+
     def linux_ping(self, ip, ipv6=False):
         """
         Issue a Unix-specific ping command to send one ping packet.
@@ -78,8 +171,10 @@ class PingAll:
             ping_cmd = ["ping6", "-c1", "-W2", ip]
         else:
             ping_cmd = ["ping", "-c1", "-W2", ip]
-        ret = call(ping_cmd)  # nosec
-        return bool(not ret)
+        proc = subprocess.run(  # nosec
+            ping_cmd, check=False, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        return proc.returncode == 0
 
     def win_ping(self, ip, ipv6=False):
         """
@@ -97,9 +192,14 @@ class PingAll:
         else:
             cmd = ["ping", "-n", "1", ip]
 
-        output = subprocess.Popen(cmd, stdout=subprocess.PIPE).communicate()[0]  # nosec
+        proc = subprocess.run(  # nosec
+            cmd, check=False, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
 
-        if ("unreachable" in output) or ("timeout" in output):
+        # Windows may report success even when the destination is unreachable,
+        # so the output needs to be checked as well.
+        output = proc.stdout
+        if proc.returncode or b"unreachable" in output or b"timed out" in output:
             return False
 
         return True
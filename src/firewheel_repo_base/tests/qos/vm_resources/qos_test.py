@@ -1,9 +1,14 @@
 #!/usr/bin/env python3
 
+import re
 import sys
 import subprocess
 from time import sleep
 
+# Patterns for the summary lines at the end of the ``ping`` output.
+_LOSS_RE = re.compile(rb"([\d.]+)% packet loss")
+_RTT_RE = re.compile(rb"min/avg/max[^=]*=\s*[\d.]+/([\d.]+)/")
+
 
 # This class should remain Python 2 compatible
 class QosTest(object):
@@ -32,6 +37,8 @@ class QosTest(object):
     def linux_ping(self, ip):
         """
         Issue a ping command which will send 100 packets to the given IP address.
+        The packets are sent 0.2 seconds apart (the fastest rate permitted for
+        unprivileged users) so that the measurement does not take 100 seconds.
 
         Args:
             ip (str): An IP address to ping.
@@ -39,55 +46,43 @@ class QosTest(object):
         Returns:
             str: The output from the ping command.
         """
-        ping_cmd = ["ping", "-c100", ip]
-        return subprocess.check_output(ping_cmd)  # nosec
+        ping_cmd = ["ping", "-c100", "-i0.2", ip]
+        return subprocess.check_output(ping_cmd, stderr=subprocess.DEVNULL)  # nosec
 
     def parse_drops(self, output):
         """
         Parse the percent of dropped packets.
 
         Args:
-            output (str): The string output that should be parsed.
+            output (bytes): The ``ping`` output that should be parsed.
 
         Returns:
             str: The percentage of dropped packets.
         """
-        lines = output.split("\n")
-
-        loss_line = ""
-        for line in lines:
-            if "packet loss" in line:
-                loss_line = line
-
-        percent = 0
-        for words in loss_line.split():
-            if "%" in words:
-                percent = words.strip("%")
-        return percent
+        match = _LOSS_RE.search(output)
+        return match.group(1).decode() if match else "0"
 
     def parse_delay(self, output):
         """
         Parse the amount of packet delay.
 
         Args:
-            output (str): The string output that should be parsed.
+            output (bytes): The ``ping`` output that should be parsed.
 
         Returns:
             str: The amount of packet delay.
         """
-        lines = output.split("\n")
-
-        avg_line = ""
-        for line in lines:
-            if "min/avg/max" in line:
-                avg_line = line
-        return avg_line.split("/")[-3]
+        match = _RTT_RE.search(output)
+        return match.group(1).decode() if match else ""
 
     def run(self):
         """
         The main function for pinging IPs, getting the output, and writing the result
         to the status file.
         """
+        parsers = {"drops": self.parse_drops, "delay": self.parse_delay}
+        parse = parsers.get(self.parse_type)
+        results = []
         for ip in self.ips:
             success = ""
             attempt = 0
@@ -101,16 +96,13 @@ class QosTest(object):
                 sys.stdout.flush()
                 sleep(5)
 
-            output = None
-            if self.parse_type == "drops":
-                output = self.parse_drops(success)
-            elif self.parse_type == "delay":
-                output = self.parse_delay(success)
+            if parse is None:
+                results.append("Unknown parse type")
             else:
-                output = "Unknown parse type"
+                results.append(parse(success))
 
-            with open(self.status_file, "a", encoding="utf-8") as f_hand:
-                f_hand.write(output)
+        with open(self.status_file, "a", encoding="utf-8") as f_hand:
+            f_hand.write("".join(results))
 
 
 if __name__ == "__main__":
@@ -19,10 +19,12 @@ class Plugin(AbstractPlugin):
                 is maintained. Must be castable to an integer. Defaults to ``""``.
         """
 
+        reboot_vmr = f"{reboot_type}.py"
+        extra_vrm_time = int(extra_vrm) if extra_vrm else None
+
         for v in self.g.get_vertices():
             if v.is_decorated_by(VMEndpoint):
-                v.run_executable(-10, f"{reboot_type}.py", vm_resource=True)
+                v.run_executable(-10, reboot_vmr, vm_resource=True)
 
-                if extra_vrm:
-                    time = int(extra_vrm)
-                    v.run_executable(time, "echo.sh", vm_resource=True)
+                if extra_vrm_time is not None:
+                    v.run_executable(extra_vrm_time, "echo.sh", vm_resource=True)
@@ -67,11 +67,11 @@ class RouterTree(AbstractPlugin):
 
             # Get the next subnet
             bgp_net = next(control_nets)
-            bgp_ips = bgp_net.iter_hosts()
+            bgp_netmask = bgp_net.netmask
 
             # Connect both the root BGP router and the leaf BGP router
-            leaf.connect(switch, next(bgp_ips), bgp_net.netmask)
-            root.connect(switch, next(bgp_ips), bgp_net.netmask)
+            leaf.connect(switch, netaddr.IPAddress(bgp_net.first + 1), bgp_netmask)
+            root.connect(switch, netaddr.IPAddress(bgp_net.first + 2), bgp_netmask)
 
             # Make sure that the routers peer with each other via BGP
             root.link_bgp(leaf, switch, switch)
@@ -95,9 +95,9 @@ class RouterTree(AbstractPlugin):
         """
 
         # Get the next subnet in the `host_nets` IP block
-        # Then get an iter of IPs for that subnet
+        # The first two host addresses are computed directly from its integer value
         host_net = next(host_nets)
-        host_ips = host_net.iter_hosts()
+        host_netmask = host_net.netmask
 
         # Create a host
         host = Vertex(self.g, f"host.{name}")
@@ -113,13 +113,17 @@ class RouterTree(AbstractPlugin):
 
         # Connect the OSPF router and Host to the Switch.
         # Use the `host_nets` IP network as the IP address for the VMs
-        ospf.connect(switch_host_to_ospf, next(host_ips), host_net.netmask)
-        host.connect(switch_host_to_ospf, next(host_ips), host_net.netmask)
+        ospf.connect(
+            switch_host_to_ospf, netaddr.IPAddress(host_net.first + 1), host_netmask
+        )
+        host.connect(
+            switch_host_to_ospf, netaddr.IPAddress(host_net.first + 2), host_netmask
+        )
 
         # Get the next subnet in the `control_nets` IP block
-        # Then get an iter of IPs for that subnet
+        # The first two host addresses are computed directly from its integer value
         ospf_net = next(control_nets)
-        ospf_ips = ospf_net.iter_hosts()
+        ospf_netmask = ospf_net.netmask
 
         # Create a BGP Router
         bgp = Vertex(self.g, f"bgp.{name}")
@@ -137,8 +141,12 @@ class RouterTree(AbstractPlugin):
         # We use the ospf_connect method which enables us to define the connection
         # as an OSPF connection.
         # Use the `control_nets` IP network as the IP address for the VMs
-        ospf.ospf_connect(switch_ospf_to_bgp, next(ospf_ips), ospf_net.netmask)
-        bgp.ospf_connect(switch_ospf_to_bgp, next(ospf_ips), ospf_net.netmask)
+        ospf.ospf_connect(
+            switch_ospf_to_bgp, netaddr.IPAddress(ospf_net.first + 1), ospf_netmask
+        )
+        bgp.ospf_connect(
+            switch_ospf_to_bgp, netaddr.IPAddress(ospf_net.first + 2), ospf_netmask
+        )
 
         # Redistribute routes for directly connected subnets to OSPF peers.
         ospf.redistribute_ospf_connected()
@@ -26,44 +26,44 @@ class UploadSchedule(AbstractPlugin):
         vm_mapping = VMMapping()
         sched_list = []
         mapping_list = []
+        required_vm_resources = self.g.required_vm_resources
         for vert in self.g.get_vertices():
             if not vert.is_decorated_by(VMEndpoint):
                 continue
+            control_ip = getattr(vert, "control_ip", None)
+            if control_ip is not None:
+                control_ip = str(control_ip)
             try:
-                control_ip = None
-                try:
-                    control_ip = str(vert.control_ip)
-                except AttributeError:
-                    pass
                 sched = list(vert.vm_resource_schedule.get_schedule())
-                self.log.debug("Schedule length %d for %s", len(sched), vert.name)
-                schedule = pickle.dumps(sched)
-
-                # add required vm_resources to set
-                for item in sched:
-                    for data_entry in item.data:
-                        try:
-                            self.g.required_vm_resources.add(data_entry["filename"])
-                        except KeyError:
-                            # some vm_resources don't have files to upload
-                            continue
-
-                self.log.debug("Got schedule %s for %s", schedule, vert.name)
-                sched_list.append(
-                    {"server_name": vert.name, "text": schedule, "ip": control_ip}
-                )
-                self.log.debug(
-                    "Adding %s %s %s to VM Mapping", vert.uuid, control_ip, vert.name
-                )
-                mapping_list.append(
-                    {
-                        "server_uuid": vert.uuid,
-                        "server_name": vert.name,
-                        "control_ip": control_ip,
-                    }
-                )
             except AttributeError:
                 self.log.exception('No vm_resource schedule for VM "%s".', vert.name)
+                continue
+            self.log.debug("Schedule length %d for %s", len(sched), vert.name)
+            schedule = pickle.dumps(sched, pickle.HIGHEST_PROTOCOL)
+
+            # add required vm_resources to set
+            # some vm_resources don't have files to upload
+            required_vm_resources.update(
+                data_entry["filename"]
+                for item in sched
+                for data_entry in item.data
+                if "filename" in data_entry
+            )
+
+            self.log.debug("Got %d byte schedule for %s", len(schedule), vert.name)
+            sched_list.append(
+                {"server_name": vert.name, "text": schedule, "ip": control_ip}
+            )
+            self.log.debug(
+                "Adding %s %s %s to VM Mapping", vert.uuid, control_ip, vert.name
+            )
+            mapping_list.append(
+                {
+                    "server_uuid": vert.uuid,
+                    "server_name": vert.name,
+                    "control_ip": control_ip,
+                }
+            )
 
         # Batch insert into the databases for performance reasons
         if sched_list: